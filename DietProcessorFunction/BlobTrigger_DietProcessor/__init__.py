@@ -1,50 +1,127 @@
+import asyncio
 import logging
-import pandas as pd
-import json
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import orjson
 import os
-from azure.storage.blob import BlobServiceClient
-from io import StringIO
+from azure.storage.blob.aio import BlobServiceClient
+from io import BytesIO
+from urllib.parse import quote
+from search_utils import fingerprint
 
 CONNECTION_STRING = os.getenv("AzureWebJobsStorage")
 CONTAINER_NAME = "diet-data"
+MACRO_COLS = ["Calories", "Protein", "Carbs", "Fat"]
+CATEGORY_COLS = ["Diet_type", "Cuisine_type"]
+DIET_PREFIX = "by_diet/"
+TEXT_COLS = CATEGORY_COLS + ["Recipe_name"]
+# Macros stay float64: GetRecipes serves the stored values as-is, and float32
+# would turn 250.3 into 250.3000030517578 in its responses
+CSV_TYPES = {
+    "Diet_type": pa.dictionary(pa.int32(), pa.string()),
+    "Cuisine_type": pa.dictionary(pa.int32(), pa.string()),
+    "Recipe_name": pa.string(),
+    "Calories": pa.float64(),
+    "Protein": pa.float64(),
+    "Carbs": pa.float64(),
+    "Fat": pa.float64(),
+}
 
-def main(blob: bytes):
-    logging.info("All_Diets.csv updated. Running cleaning & calculations.")
-
+# Built once per worker so warm invocations reuse the HTTP connection pool
+container = None
+if CONNECTION_STRING:
     blob_service = BlobServiceClient.from_connection_string(CONNECTION_STRING)
     container = blob_service.get_container_client(CONTAINER_NAME)
 
-    # Reads CSV data
-    df = pd.read_csv(StringIO(blob.decode("utf-8")))
+def _upload_parquet(name, frame):
+    buf = BytesIO()
+    frame.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    buf.seek(0)
+    return container.upload_blob(
+        name=name,
+        data=buf,
+        length=buf.getbuffer().nbytes,
+        overwrite=True
+    )
 
-    # Data Cleaning 
-    df.drop_duplicates(inplace=True)
-    df.fillna("Unknown", inplace=True)
+async def main(blob: bytes):
+    logging.info("All_Diets.csv updated. Running cleaning & calculations.")
 
-    # Saves cleaned CSV
-    container.upload_blob(
-        name="Cleaned_Diets.csv",
-        data=df.to_csv(index=False),
-        overwrite=True
+    # Reads CSV data with Arrow's multithreaded parser, straight from the raw bytes
+    table = pacsv.read_csv(
+        pa.BufferReader(blob),
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(CSV_TYPES),
+            column_types=CSV_TYPES,
+            strings_can_be_null=True
+        )
     )
+    df = table.to_pandas()
 
-    # Calculations
-    diet_summary = df["Diet_type"].value_counts().to_dict()
+    # Data Cleaning 
+    # A recipe is identified by its name within a diet; hashing just those
+    # two columns (Diet_type via its category codes) beats hashing every column
+    df.drop_duplicates(subset=["Recipe_name", "Diet_type"], keep="first", inplace=True)
+    for col in CATEGORY_COLS:
+        if "Unknown" not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories("Unknown")
+    # Placeholder only for text columns; numeric gaps stay NaN (skipped by the means)
+    df.fillna({col: "Unknown" for col in TEXT_COLS}, inplace=True)
 
-    macro_averages = df[
-        ["Calories", "Protein", "Carbs", "Fat"]
-    ].mean().to_dict()
+    # Lowercased once here so keyword searches don't case-fold per request
+    df["Recipe_name_lower"] = df["Recipe_name"].str.lower()
+    df["Recipe_name_fp"] = np.fromiter(
+        (fingerprint(name) for name in df["Recipe_name_lower"]),
+        dtype=np.uint64,
+        count=len(df)
+    )
 
-    container.upload_blob(
-        name="diet_summary.json",
-        data=json.dumps(diet_summary),
-        overwrite=True
+    # Calculations (one grouped pass feeds both results)
+    agg = df.groupby("Diet_type", sort=False, observed=True).agg(
+        recipes=("Diet_type", "size"),
+        **{f"{col}_sum": (col, "sum") for col in MACRO_COLS},
+        **{f"{col}_n": (col, "count") for col in MACRO_COLS}
     )
 
-    container.upload_blob(
-        name="macro_averages.json",
-        data=json.dumps(macro_averages),
-        overwrite=True
+    diet_summary = agg["recipes"].sort_values(ascending=False, kind="stable").to_dict()
+
+    # Overall means from per-diet sums/counts (same as df[MACRO_COLS].mean());
+    # the sums come from the float64 source columns, so no float32 noise
+    sums = agg[[f"{col}_sum" for col in MACRO_COLS]].sum().to_numpy()
+    counts = agg[[f"{col}_n" for col in MACRO_COLS]].sum().to_numpy()
+    macro_averages = dict(zip(MACRO_COLS, sums / counts))
+
+    # Cleaned data as Parquet (typed, columnar, no text parsing on read), plus one
+    # partition per diet type so diet-filtered reads only fetch matching rows
+    partitions = {
+        f"{DIET_PREFIX}{quote(str(diet), safe='')}.parquet": sub
+        for diet, sub in df.groupby("Diet_type", sort=False, observed=True)
+    }
+
+    # Independent PUTs, so overlap their round trips
+    await asyncio.gather(
+        _upload_parquet("Cleaned_Diets.parquet", df),
+        *(_upload_parquet(name, sub) for name, sub in partitions.items()),
+        container.upload_blob(
+            name="diet_summary.json",
+            data=orjson.dumps(diet_summary),
+            overwrite=True
+        ),
+        container.upload_blob(
+            name="macro_averages.json",
+            data=orjson.dumps(macro_averages, option=orjson.OPT_SERIALIZE_NUMPY),
+            overwrite=True
+        )
     )
 
+    # Diet types no longer in the data must not keep serving old partitions
+    stale = [
+        item.name
+        async for item in container.list_blobs(name_starts_with=DIET_PREFIX)
+        if item.name not in partitions
+    ]
+    await asyncio.gather(*(container.delete_blob(name) for name in stale))
+
     logging.info("Cached cleaned data and results successfully.")
@@ -1,46 +1,170 @@
-import json
-import pandas as pd
+import numpy as np
+import orjson
 import os
+import threading
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient
-from io import StringIO
+from io import BytesIO
+from urllib.parse import quote
+from search_utils import fingerprint
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; pyarrow.compute is the fallback
+    njit = None
 
 CONNECTION_STRING = os.getenv("AzureWebJobsStorage")
 CONTAINER_NAME = "diet-data"
+CLEANED_BLOB = "Cleaned_Diets.parquet"
+DIET_PREFIX = "by_diet/"
+SUMMARY_BLOB = "diet_summary.json"
+COLUMNS = ["Diet_type", "Recipe_name", "Calories", "Protein", "Carbs", "Fat"]
+SEARCH_COLUMN = "Recipe_name_lower"
+FINGERPRINT_COLUMN = "Recipe_name_fp"
 
-def main(req):
+# Built once per worker so warm invocations reuse the HTTP connection pool
+container = None
+if CONNECTION_STRING:
     blob_service = BlobServiceClient.from_connection_string(CONNECTION_STRING)
     container = blob_service.get_container_client(CONTAINER_NAME)
 
-    # Loads CLEANED cached data
-    blob = container.get_blob_client("Cleaned_Diets.csv")
-    data = blob.download_blob().readall()
-    df = pd.read_csv(StringIO(data.decode("utf-8")))
+# Cleaned tables kept in memory across warm invocations: blob name -> ETag + data
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
 
-    # Query params
-    diet = req.params.get("diet")
-    keyword = req.params.get("q")
-    page = int(req.params.get("page", 1))
-    page_size = 10
+if njit is not None:
+    # Compiled on first use, then reused for the life of the worker
+    @njit(parallel=True)
+    def _contains_kernel(values, offsets, rows, needle, out):
+        m = len(needle)
+        for i in prange(len(rows)):
+            row = rows[i]
+            found = False
+            j = offsets[row]
+            stop = offsets[row + 1] - m
+            while j <= stop and not found:
+                k = 0
+                while k < m and values[j + k] == needle[k]:
+                    k += 1
+                found = k == m
+                j += 1
+            out[i] = found
 
-    if diet:
-        df = df[df["Diet_type"] == diet]
+def _name_buffers(column):
+    # Raw UTF-8 data and offsets of the lowercased names (Arrow string layout)
+    arr = column.combine_chunks()
+    is_large = pa.types.is_large_string(arr.type)
+    if len(arr) == 0 or not (is_large or pa.types.is_string(arr.type)):
+        return None
 
-    if keyword:
-        df = df[df["Recipe_name"].str.contains(keyword, case=False, na=False)]
+    _, offsets, data = arr.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64 if is_large else np.int32)
+    offsets = offsets[arr.offset:arr.offset + len(arr) + 1]
+    if data is None:
+        values = np.empty(0, dtype=np.uint8)
+    else:
+        values = np.frombuffer(data, dtype=np.uint8)
+    return values, offsets
 
-    total = len(df)
-    start = (page - 1) * page_size
-    end = start + page_size
+def _load_cleaned_data(blob_name):
+    blob = container.get_blob_client(blob_name)
+    props = blob.get_blob_properties()
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get(blob_name)
+        if cached and props.etag == cached["etag"]:
+            return cached
+
+    # Only the projected columns are decoded
+    downloader = blob.download_blob()
+    table = pq.read_table(
+        BytesIO(downloader.readall()),
+        columns=COLUMNS + [SEARCH_COLUMN, FINGERPRINT_COLUMN]
+    )
+    entry = {
+        "etag": downloader.properties.etag,
+        "table": table.select(COLUMNS),
+        "search": table[SEARCH_COLUMN],
+        "names": _name_buffers(table[SEARCH_COLUMN]) if njit is not None else None,
+        "fingerprints": table[FINGERPRINT_COLUMN].to_numpy()
+    }
+
+    with _CACHE_LOCK:
+        _CACHE[blob_name] = entry
+
+    return entry
+
+def _diet_absent(diet):
+    # The summary lists every diet that has recipes; without it (data not
+    # processed yet) a missing partition says nothing about the diet
+    try:
+        blob = container.get_blob_client(SUMMARY_BLOB)
+        summary = orjson.loads(blob.download_blob().readall())
+    except ResourceNotFoundError:
+        return False
+    return diet not in summary
+
+def _keyword_matches(entry, keyword):
+    # Cheap bitmap pre-filter: only names holding every byte of the keyword
+    # (mod 64) go on to the real substring check
+    bits = np.uint64(fingerprint(keyword))
+    rows = np.flatnonzero((entry["fingerprints"] & bits) == bits)
 
-    results = df.iloc[start:end].to_dict(orient="records")
+    if entry["names"] is None:
+        hits = pc.match_substring(entry["search"].take(rows), keyword)
+        return rows[pc.fill_null(hits, False).to_numpy()]
 
+    values, offsets = entry["names"]
+    out = np.empty(len(rows), dtype=np.bool_)
+    needle = np.frombuffer(keyword.encode("utf-8"), dtype=np.uint8)
+    _contains_kernel(values, offsets, rows, needle, out)
+    return rows[out]
+
+def _response(total, page, page_size, results):
     return {
         "status": 200,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps({
+        "body": orjson.dumps({
             "total": total,
             "page": page,
             "pageSize": page_size,
             "data": results
         })
     }
+
+def main(req):
+    # Query params
+    diet = req.params.get("diet")
+    keyword = req.params.get("q")
+    page = max(int(req.params.get("page", 1)), 1)
+    page_size = 10
+
+    # Loads CLEANED cached data; a diet filter reads just that diet's partition
+    blob_name = CLEANED_BLOB
+    if diet:
+        blob_name = f"{DIET_PREFIX}{quote(diet, safe='')}.parquet"
+
+    try:
+        entry = _load_cleaned_data(blob_name)
+    except ResourceNotFoundError:
+        if not diet or not _diet_absent(diet):
+            raise
+        # Processed data has no recipes of that diet type
+        return _response(0, page, page_size, [])
+
+    table = entry["table"]
+    start = (page - 1) * page_size
+
+    if keyword:
+        # Names were lowercased at cleaning time; only the keyword needs folding
+        matches = _keyword_matches(entry, keyword.lower())
+        total = len(matches)
+        page_rows = table.take(matches[start:start + page_size])
+    else:
+        total = table.num_rows
+        page_rows = table.slice(start, page_size)
+
+    return _response(total, page, page_size, page_rows.to_pylist())
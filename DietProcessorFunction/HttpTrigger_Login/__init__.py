@@ -1,7 +1,19 @@
-import json
+import asyncio
+import logging
+import orjson
 import os
+from concurrent.futures import ThreadPoolExecutor
 from azure.cosmos import CosmosClient
-from auth_utils import verify_password
+from azure.cosmos.exceptions import (
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError
+)
+from auth_utils import (
+    LEGACY_EMAIL_LOOKUP,
+    find_legacy_users,
+    hash_password,
+    verify_password
+)
 
 client = CosmosClient(
     os.getenv("COSMOS_URI"),
@@ -9,27 +21,82 @@ client = CosmosClient(
 )
 container = client.get_database_client("DietDB").get_container_client("Users")
 
-def main(req):
+# bcrypt and the (synchronous) Cosmos calls both block; run them off the event loop
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Checked against on unknown emails so both paths cost one bcrypt verify
+_DUMMY_HASH = hash_password("dummy-password")
+
+def _find_user(email):
+    # Point-read by id/partition key (both the normalized email)
+    user_id = email.lower()
+
+    try:
+        return container.read_item(item=user_id, partition_key=user_id)
+    except CosmosResourceNotFoundError:
+        return None
+
+def _find_legacy_user(email, password):
+    # Pre-migration accounts still carry a uuid id. Several can share a
+    # normalized email (or share it with an email-keyed account), so the
+    # password picks the one being logged into
+    for user in find_legacy_users(container, email):
+        if verify_password(password, user["passwordHash"]):
+            return user
+    return None
+
+def _migrate_user(user):
+    # Re-key a legacy account by its normalized email so later logins are
+    # point-reads; Cosmos system properties (_rid, _etag, ...) aren't copied
+    user_id = user["email"].lower()
+    migrated = {k: v for k, v in user.items() if not k.startswith("_")}
+    migrated["id"] = user_id
+
+    try:
+        try:
+            container.create_item(migrated)
+        except CosmosResourceExistsError:
+            existing = container.read_item(item=user_id, partition_key=user_id)
+            if existing.get("passwordHash") != user["passwordHash"]:
+                # Another account owns the id (the same email in another
+                # casing); this one stays under its uuid id, where the
+                # legacy lookup still finds it
+                logging.error(
+                    f"Legacy user {user['id']} not migrated: "
+                    f"id {user_id} belongs to another account"
+                )
+                return
+            # Same account: an earlier migration created the copy but its
+            # delete failed, so only the delete is left
+        container.delete_item(item=user["id"], partition_key=user["id"])
+    except Exception as e:
+        logging.warning(f"Could not migrate legacy user {user['id']}: {e}")
+
+async def main(req):
     body = req.get_json()
 
     email = body["email"]
     password = body["password"]
 
-    users = list(container.query_items(
-        query="SELECT * FROM c WHERE c.email=@email",
-        parameters=[{"name": "@email", "value": email}],
-        enable_cross_partition_query=True
-    ))
+    loop = asyncio.get_running_loop()
+    user = await loop.run_in_executor(_executor, _find_user, email)
+
+    password_hash = user["passwordHash"] if user else _DUMMY_HASH
+    ok = await loop.run_in_executor(_executor, verify_password, password, password_hash)
 
-    if not users:
-        return {"status": 401, "body": "Invalid credentials"}
+    # No email-keyed match: check legacy accounts, only while the migration
+    # flag is set
+    if not (user and ok) and LEGACY_EMAIL_LOOKUP:
+        user = await loop.run_in_executor(_executor, _find_legacy_user, email, password)
+        ok = user is not None
 
-    user = users[0]
+    if user and ok:
+        if user["id"] != user["email"].lower():
+            await loop.run_in_executor(_executor, _migrate_user, user)
 
-    if verify_password(password, user["passwordHash"]):
         return {
             "status": 200,
-            "body": json.dumps({
+            "body": orjson.dumps({
                 "name": user["name"],
                 "email": user["email"]
             })
@@ -1,8 +1,8 @@
-import json
-import uuid
+import orjson
 import os
 from azure.cosmos import CosmosClient
-from auth_utils import hash_password
+from azure.cosmos.exceptions import CosmosResourceExistsError
+from auth_utils import LEGACY_EMAIL_LOOKUP, find_legacy_users, hash_password
 
 client = CosmosClient(
     os.getenv("COSMOS_URI"),
@@ -10,20 +10,37 @@ client = CosmosClient(
 )
 container = client.get_database_client("DietDB").get_container_client("Users")
 
+def _exists_response():
+    return {
+        "status": 409,
+        "body": orjson.dumps({"message": "User already exists"})
+    }
+
 def main(req):
     body = req.get_json()
 
+    # A pre-migration account with this email (in any casing) has a uuid id,
+    # so create_item's id conflict check can't see it
+    if LEGACY_EMAIL_LOOKUP and find_legacy_users(container, body["email"]):
+        return _exists_response()
+
+    # Users are keyed (and partitioned) by normalized email so login is a point-read
+    user_id = body["email"].lower()
+
     user = {
-        "id": str(uuid.uuid4()),
+        "id": user_id,
         "name": body["name"],
         "email": body["email"],
         "passwordHash": hash_password(body["password"]),
         "provider": "local"
     }
 
-    container.create_item(user)
+    try:
+        container.create_item(user)
+    except CosmosResourceExistsError:
+        return _exists_response()
 
     return {
         "status": 201,
-        "body": json.dumps({"message": "User registered successfully"})
+        "body": orjson.dumps({"message": "User registered successfully"})
     }
@@ -1,8 +1,90 @@
-import json
 import logging
+import threading
+from typing import Optional
+import orjson
 import azure.functions as func
 
-from .azure_diet_processor import AzureDietDataProcessor
+from .azure_diet_processor import AzureDietDataProcessor, to_json_bytes
+
+
+def _recipes(processor, req):
+    # Enhanced recipes endpoint with pagination and filtering
+    page = int(req.params.get("page", 1))
+    page_size = int(req.params.get("page_size", 20))
+    diet_type = req.params.get("diet_type", "")
+    search_term = req.params.get("search", "")
+    return processor.get_recipes_paginated(page, page_size, diet_type, search_term)
+
+
+def _scatter_plot(processor, req):
+    # Scatter plot data: Nutrient relationships
+    x_nutrient = req.params.get("x", "Protein")
+    y_nutrient = req.params.get("y", "Carbs")
+    return processor.get_scatter_plot_data(x_nutrient, y_nutrient)
+
+
+def _top_recipes(processor, req):
+    nutrient = req.params.get("nutrient", "Protein")
+    try:
+        n = int(req.params.get("n", 10))
+    except (TypeError, ValueError):
+        n = 10
+    n = max(1, min(n, 100))
+    return processor.get_top_recipes_by_nutrient(nutrient, n)
+
+
+def _search(processor, req):
+    search_term = req.params.get("term", "")
+    search_field = req.params.get("field", "Recipe_name")
+    return processor.search_recipes(search_term, search_field)
+
+
+# Kept across warm invocations so unchanged data (and its cached results)
+# isn't reloaded. New data gets a new processor that replaces this one, so a
+# processor is never reloaded while handlers run on it outside the lock
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def _get_processor() -> Optional[AzureDietDataProcessor]:
+    """Processor for the blob's current data, or None if it failed to load"""
+    global _processor
+    with _processor_lock:
+        if _processor is None or not _processor.is_current():
+            processor = AzureDietDataProcessor()
+            # Load data from Azure Blob Storage
+            if not processor.load_data_from_blob():
+                return None
+            _processor = processor
+        return _processor
+
+
+# Operation -> handler(processor, req); one dict lookup per request
+HANDLERS = {
+    # Main API for dashboard - returns comprehensive nutritional insights
+    "nutritional-insights": lambda p, req: p.get_nutritional_insights(),
+    # Get data formatted for specific chart types
+    "chart-data": lambda p, req: p.get_chart_data(req.params.get("type", "bar")),
+    "recipes": _recipes,
+    # Clustering analysis for recipe grouping
+    "clusters": lambda p, req: p.get_recipe_clusters(),
+    # Get available diet types for filter dropdown
+    "diet-types": lambda p, req: p.get_diet_types(),
+    # Bar chart data: Average macronutrient content by diet type
+    "bar-chart": lambda p, req: p.get_bar_chart_data(),
+    "scatter-plot": _scatter_plot,
+    # Heatmap data: Nutrient correlations
+    "heatmap": lambda p, req: p.get_heatmap_data(),
+    # Pie chart data: Recipe distribution by diet type
+    "pie-chart": lambda p, req: p.get_pie_chart_data(),
+    "summary": lambda p, req: p.get_diet_summary(),
+    "macronutrients": lambda p, req: p.get_macronutrient_averages(),
+    "comparison": lambda p, req: p.get_diet_comparison_data(),
+    "top-recipes": _top_recipes,
+    "cuisine-distribution": lambda p, req: p.get_cuisine_distribution(),
+    "nutrient-ranges": lambda p, req: p.get_nutrient_ranges(),
+    "search": _search,
+}
 
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
@@ -33,111 +115,44 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         # Handle health check first
         if operation == "health":
             return func.HttpResponse(
-                json.dumps({"status": "healthy", "message": "Function is running"}),
+                orjson.dumps({"status": "healthy", "message": "Function is running"}),
                 status_code=200,
                 mimetype="application/json",
                 headers=cors_headers,
             )
 
-        # Initialize the processor
-        processor = AzureDietDataProcessor()
+        # Search needs a term; reject it before loading any data
+        if operation == "search" and not req.params.get("term", ""):
+            return func.HttpResponse(
+                orjson.dumps({"error": "Search term is required"}),
+                status_code=400,
+                mimetype="application/json",
+                headers=cors_headers,
+            )
 
-        # Load data from Azure Blob Storage
-        if not processor.load_data_from_blob():
+        # Initialize the processor (reloads only if the blob has changed)
+        processor = _get_processor()
+        if processor is None:
             return func.HttpResponse(
-                json.dumps({"error": "Failed to load data from blob storage"}),
+                orjson.dumps({"error": "Failed to load data from blob storage"}),
                 status_code=500,
                 mimetype="application/json",
                 headers=cors_headers,
             )
 
         # Route to appropriate function based on operation
-        if operation == "nutritional-insights":
-            # Main API for dashboard - returns comprehensive nutritional insights
-            result = processor.get_nutritional_insights()
-
-        elif operation == "chart-data":
-            # Get data formatted for specific chart types
-            chart_type = req.params.get("type", "bar")
-            result = processor.get_chart_data(chart_type)
-
-        elif operation == "recipes":
-            # Enhanced recipes endpoint with pagination and filtering
-            page = int(req.params.get("page", 1))
-            page_size = int(req.params.get("page_size", 20))
-            diet_type = req.params.get("diet_type", "")
-            search_term = req.params.get("search", "")
-            result = processor.get_recipes_paginated(
-                page, page_size, diet_type, search_term
-            )
-
-        elif operation == "clusters":
-            # Clustering analysis for recipe grouping
-            result = processor.get_recipe_clusters()
-
-        elif operation == "diet-types":
-            # Get available diet types for filter dropdown
-            result = processor.get_diet_types()
-
-        elif operation == "bar-chart":
-            # Bar chart data: Average macronutrient content by diet type
-            result = processor.get_bar_chart_data()
-
-        elif operation == "scatter-plot":
-            # Scatter plot data: Nutrient relationships
-            x_nutrient = req.params.get("x", "Protein")
-            y_nutrient = req.params.get("y", "Carbs")
-            result = processor.get_scatter_plot_data(x_nutrient, y_nutrient)
-
-        elif operation == "heatmap":
-            # Heatmap data: Nutrient correlations
-            result = processor.get_heatmap_data()
-
-        elif operation == "pie-chart":
-            # Pie chart data: Recipe distribution by diet type
-            result = processor.get_pie_chart_data()
-
-        elif operation == "summary":
-            result = processor.get_diet_summary()
-
-        elif operation == "macronutrients":
-            result = processor.get_macronutrient_averages()
-
-        elif operation == "comparison":
-            result = processor.get_diet_comparison_data()
-
-        elif operation == "top-recipes":
-            nutrient = req.params.get("nutrient", "Protein")
-            try:
-                n = int(req.params.get("n", 10))
-            except (TypeError, ValueError):
-                n = 10
-            n = max(1, min(n, 100))
-            result = processor.get_top_recipes_by_nutrient(nutrient, n)
-
-        elif operation == "cuisine-distribution":
-            result = processor.get_cuisine_distribution()
-
-        elif operation == "nutrient-ranges":
-            result = processor.get_nutrient_ranges()
+        handler = HANDLERS.get(operation)
+        if handler is not None:
+            result = handler(processor, req)
 
         elif operation.startswith("recipes/"):
-            diet_type = operation.replace("recipes/", "")
+            diet_type = operation[len("recipes/"):]
             result = processor.get_recipes_by_diet_type(diet_type)
 
-        elif operation == "search":
-            search_term = req.params.get("term", "")
-            search_field = req.params.get("field", "Recipe_name")
-            if not search_term:
-                return func.HttpResponse(
-                    json.dumps({"error": "Search term is required"}),
-                    status_code=400,
-                    mimetype="application/json",
-                    headers=cors_headers,
-                )
-            result = processor.search_recipes(search_term, search_field)
-
         else:
+            result = None
+
+        if result is None:
             # Default: return available operations
             result = {
                 "message": "Welcome to Enhanced Diet Data Processor API",
@@ -175,7 +190,7 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
             }
 
         return func.HttpResponse(
-            json.dumps(result, indent=2),
+            to_json_bytes(result),
             status_code=200,
             mimetype="application/json",
             headers=cors_headers,
@@ -184,7 +199,7 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logging.error(f"Error processing request: {str(e)}")
         return func.HttpResponse(
-            json.dumps({"error": f"Internal server error: {str(e)}"}),
+            orjson.dumps({"error": f"Internal server error: {str(e)}"}),
             status_code=500,
             mimetype="application/json",
             headers=cors_headers,
@@ -1,4 +1,10 @@
 import bcrypt
+import os
+
+# On while accounts registered before ids were email-keyed (uuid ids) remain.
+# Each one moves to an email-keyed id on its next login; once none are left,
+# set it to "false" so unknown emails stop paying for a cross-partition query
+LEGACY_EMAIL_LOOKUP = os.getenv("LEGACY_EMAIL_LOOKUP", "true").lower() != "false"
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(
@@ -11,3 +17,14 @@ def verify_password(password: str, hashed: str) -> bool:
         password.encode("utf-8"),
         hashed.encode("utf-8")
     )
+
+def find_legacy_users(container, email):
+    # Legacy accounts can only be found by querying the email across partitions.
+    # Matched case-insensitively, as ids are: "Foo@x.com" and "foo@x.com" both
+    # map to the id "foo@x.com"
+    user_id = email.lower()
+    return list(container.query_items(
+        query="SELECT * FROM c WHERE LOWER(c.email)=@email AND c.id!=@email",
+        parameters=[{"name": "@email", "value": user_id}],
+        enable_cross_partition_query=True
+    ))
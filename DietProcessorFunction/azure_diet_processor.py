@@ -3,9 +3,211 @@ import numpy as np
 import os
 import io
 import logging
-from typing import Dict, List, Optional, Union
+import functools
+import threading
+import orjson
+from typing import Callable, Dict, List, Optional, Union
 from azure.storage.blob import BlobServiceClient
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; pandas' to_csv is the fallback
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; pandas' DataFrame.corr is the fallback
+    njit = None
+
+CONNECTION_STRING = os.getenv("AzureWebJobsStorage")
+
+
+def _create_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """Blob service client on a pooled keep-alive transport with large range reads"""
+    return BlobServiceClient.from_connection_string(
+        connection_string,
+        transport=RequestsTransport(connection_timeout=5, read_timeout=30),
+        max_single_get_size=64 * 1024 * 1024,
+        max_chunk_get_size=8 * 1024 * 1024,
+    )
+
+
+# Built once per worker so warm invocations reuse the HTTP connection pool
+blob_service = None
+if CONNECTION_STRING:
+    blob_service = _create_blob_service_client(CONNECTION_STRING)
+
+# Palette cycled through for per-diet chart colours
+CHART_COLORS = ["#FF6384", "#36A2EB", "#FFCE56", "#4BC0C0", "#9966FF", "#FF9F40"]
+
+# Column types applied when parsing the diet CSV: float32 halves the numeric
+# columns and the low-cardinality text columns become categoricals
+CSV_DTYPES = {
+    "Protein(g)": "float32",
+    "Carbs(g)": "float32",
+    "Fat(g)": "float32",
+    "Diet_type": "category",
+    "Cuisine_type": "category",
+}
+
+
+def _read_diet_csv(source: io.BytesIO) -> pd.DataFrame:
+    """Parse diet CSV content with the pyarrow engine, falling back to the C engine"""
+    # Types are applied while parsing (no inference pass, no post-parse copy);
+    # both engines ignore entries for columns the CSV doesn't have
+    try:
+        return pd.read_csv(source, engine="pyarrow", dtype=CSV_DTYPES)
+    except ImportError:
+        source.seek(0)
+        return pd.read_csv(source, dtype=CSV_DTYPES, low_memory=False)
+
+
+def to_json_bytes(data: Union[Dict, List]) -> bytes:
+    """Serialize results to indented JSON, writing numpy arrays and scalars as-is"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+
+
+# Output keys and source columns shared by the recipe listing endpoints
+RECIPE_FIELDS = {
+    "recipe_name": "Recipe_name",
+    "diet_type": "Diet_type",
+    "cuisine_type": "Cuisine_type",
+    "protein": "Protein(g)",
+    "carbs": "Carbs(g)",
+    "fat": "Fat(g)",
+}
+
+
+def _recipe_records(
+    frame: pd.DataFrame, fields: Dict[str, str], **extra
+) -> List[Dict]:
+    """
+    Project recipe rows onto response dicts column-wise instead of via iterrows()
+
+    Args:
+        frame: Recipe rows to convert
+        fields: Output key -> source column; missing macro ("(g)") columns read
+            0 and other missing columns "Unknown". Numeric columns are rounded
+            to 2 decimals
+        extra: Constants or row-aligned Series appended under their own keys
+
+    Returns:
+        List[Dict]: One dict per row, in frame order
+    """
+    columns = {}
+    for key, col in fields.items():
+        if col not in frame.columns:
+            columns[key] = 0 if col.endswith("(g)") else "Unknown"
+        elif pd.api.types.is_numeric_dtype(frame[col]):
+            columns[key] = frame[col].astype("float64").round(2)
+        else:
+            columns[key] = frame[col]
+    columns.update(extra)
+
+    return pd.DataFrame(columns, index=frame.index).to_dict(orient="records")
+
+
+if njit is not None:
+    # Compiled on first use, then reused for the life of the worker
+    @njit
+    def _corr_kernel(values):
+        # Pairwise-complete Pearson matrix of mean-centred columns: every
+        # pair's sums are accumulated in the same pass over the rows
+        n_rows, n_cols = values.shape
+        n = np.zeros((n_cols, n_cols))
+        sx = np.zeros((n_cols, n_cols))
+        sy = np.zeros((n_cols, n_cols))
+        sxx = np.zeros((n_cols, n_cols))
+        syy = np.zeros((n_cols, n_cols))
+        sxy = np.zeros((n_cols, n_cols))
+        for r in range(n_rows):
+            for a in range(n_cols):
+                x = values[r, a]
+                if np.isnan(x):
+                    continue
+                for b in range(a, n_cols):
+                    y = values[r, b]
+                    if np.isnan(y):
+                        continue
+                    n[a, b] += 1.0
+                    sx[a, b] += x
+                    sy[a, b] += y
+                    sxx[a, b] += x * x
+                    syy[a, b] += y * y
+                    sxy[a, b] += x * y
+
+        out = np.full((n_cols, n_cols), np.nan)
+        for a in range(n_cols):
+            for b in range(a, n_cols):
+                if n[a, b] < 2:
+                    continue
+                cov = sxy[a, b] - sx[a, b] * sy[a, b] / n[a, b]
+                var_x = sxx[a, b] - sx[a, b] * sx[a, b] / n[a, b]
+                var_y = syy[a, b] - sy[a, b] * sy[a, b] / n[a, b]
+                if var_x <= 0 or var_y <= 0:
+                    continue
+                corr = 1.0 if a == b else cov / np.sqrt(var_x * var_y)
+                out[a, b] = out[b, a] = min(1.0, max(-1.0, corr))
+        return out
+
+
+@functools.lru_cache(maxsize=1)
+def _faiss():
+    """The faiss module, or None when it isn't installed; imported on first use"""
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+@functools.lru_cache(maxsize=1)
+def _kmeans_cls():
+    """scikit-learn's KMeans, imported on first use since importing sklearn is slow"""
+    from sklearn.cluster import KMeans
+
+    return KMeans
+
+
+def _kmeans_labels(points: np.ndarray, n_clusters: int) -> np.ndarray:
+    """K-Means cluster labels, using faiss when installed and scikit-learn otherwise"""
+    faiss = _faiss()
+    if faiss is None:
+        return _kmeans_cls()(n_clusters=n_clusters, random_state=42).fit_predict(points)
+
+    points = np.ascontiguousarray(points, dtype=np.float32)
+    kmeans = faiss.Kmeans(points.shape[1], n_clusters, niter=20, seed=42)
+    kmeans.train(points)
+    _, labels = kmeans.index.search(points, 1)
+    return labels.ravel()
+
+
+def _value_counts(column: pd.Series) -> pd.Series:
+    """value_counts() minus the zero rows a categorical reports for unused values"""
+    counts = column.value_counts()
+    return counts[counts > 0]
+
+
+def _counts_mode(counts: pd.Series):
+    """Most common value of a most-common-first count Series; ties go to the
+    smallest value, as with mode()"""
+    if len(counts) == 0:
+        return "Unknown"
+    return min(counts.index[counts.to_numpy() == counts.iat[0]])
+
+
+def _memoized(method: Callable) -> Callable:
+    """Cache a method's result (per arguments) until the data is reloaded"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        return self._memo((method.__name__,) + args, lambda: method(self, *args))
+
+    return wrapper
 
 
 class AzureDietDataProcessor:
@@ -24,25 +226,53 @@ class AzureDietDataProcessor:
             container_name: Name of the blob container containing the data
         """
         self.data = None
+        self._grouped_by_diet = None
+        # (diet_type, search_term) of the last paginated query and its row positions
+        self._page_filter = None
+        self._recipe_name_lower = None
+        # Raw numpy arrays of the nutrient columns, built once per dataset
+        self._cols: Dict[str, np.ndarray] = {}
+        self._cache: Dict = {}
+        # One lock per memo key, so concurrent requests compute each result once
+        self._cache_lock = threading.Lock()
+        self._key_locks: Dict = {}
+        # (blob name, ETag) the current data was loaded from
+        self._source = None
         self.container_name = container_name
         self.blob_name = "All_Diets.csv"
+        self.clusters_blob_name = "recipe_clusters.json"
 
         # Get connection string from parameter or environment variable
-        self.connection_string = connection_string or os.getenv("AzureWebJobsStorage")
+        self.connection_string = connection_string or CONNECTION_STRING
 
         if not self.connection_string:
             raise ValueError(
                 "Azure Storage connection string must be provided either as parameter or AzureWebJobsStorage environment variable"
             )
 
-        # Initialize blob service client
-        try:
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
-        except Exception as e:
-            logging.error(f"Failed to initialize blob service client: {e}")
-            raise
+        # Initialize blob service client, sharing the worker's client when the
+        # default connection string is used
+        if blob_service is not None and self.connection_string == CONNECTION_STRING:
+            self.blob_service_client = blob_service
+        else:
+            try:
+                self.blob_service_client = _create_blob_service_client(
+                    self.connection_string
+                )
+            except Exception as e:
+                logging.error(f"Failed to initialize blob service client: {e}")
+                raise
+
+    def is_current(self, blob_name: Optional[str] = None) -> bool:
+        """Whether the loaded data came from the blob's current version"""
+        blob_name = blob_name or self.blob_name
+        if self.data is None or self._source is None or self._source[0] != blob_name:
+            return False
+
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=blob_name
+        )
+        return blob_client.get_blob_properties().etag == self._source[1]
 
     def load_data_from_blob(self, blob_name: Optional[str] = None) -> bool:
         """
@@ -62,20 +292,43 @@ class AzureDietDataProcessor:
                 container=self.container_name, blob=blob_name
             )
 
+            # Keep the loaded data (and cached results) if the blob is unchanged
+            etag = blob_client.get_blob_properties().etag
+            if self.data is not None and self._source == (blob_name, etag):
+                return True
+
+            # A cleaned Parquet copy built from this exact CSV skips parsing
+            # and cleaning entirely
+            cleaned_blob_name = f"{os.path.splitext(blob_name)[0]}.parquet"
+            if self._load_cleaned_parquet(cleaned_blob_name, etag):
+                self._source = (blob_name, etag)
+                logging.info(
+                    f"Loaded {len(self.data)} cleaned records from {cleaned_blob_name}"
+                )
+                return True
+
             # Download blob content
             logging.info(
                 f"Downloading blob: {blob_name} from container: {self.container_name}"
             )
-            blob_data = blob_client.download_blob().readall()
+            # Stream parallel range reads straight into one buffer rather than
+            # materialising a bytes copy with readall()
+            downloader = blob_client.download_blob(max_concurrency=8)
+            blob_data = io.BytesIO()
+            downloader.readinto(blob_data)
+            blob_data.seek(0)
 
             # Load into pandas DataFrame
-            self.data = pd.read_csv(io.BytesIO(blob_data))
+            self._cache.clear()
+            self.data = _read_diet_csv(blob_data)
+            self._source = (blob_name, downloader.properties.etag)
             logging.info(
                 f"Successfully loaded {len(self.data)} records from blob storage"
             )
 
             # Clean the data
             self._clean_data()
+            self._store_cleaned_parquet(cleaned_blob_name)
             return True
 
         except ResourceNotFoundError:
@@ -87,6 +340,55 @@ class AzureDietDataProcessor:
             logging.error(f"Error loading data from blob storage: {e}")
             return False
 
+    def _load_cleaned_parquet(self, blob_name: str, source_etag: str) -> bool:
+        """Load the cleaned Parquet copy if it was built from the given source ETag"""
+        if pa is None:
+            return False
+
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=blob_name
+        )
+        # The tag is checked on the properties first so a stale copy is never
+        # downloaded; the download is then pinned to the ETag that was checked
+        try:
+            props = blob_client.get_blob_properties()
+            if props.metadata.get("source_etag") != source_etag:
+                return False
+            downloader = blob_client.download_blob(
+                max_concurrency=8,
+                etag=props.etag,
+                match_condition=MatchConditions.IfNotModified
+            )
+        except (ResourceNotFoundError, ResourceModifiedError):
+            return False
+
+        buffer = io.BytesIO()
+        downloader.readinto(buffer)
+        buffer.seek(0)
+        self.data = pd.read_parquet(buffer, engine="pyarrow")
+        self._prepare_data()
+        return True
+
+    def _store_cleaned_parquet(self, blob_name: str):
+        """Save the cleaned data as Parquet, tagged with the source CSV's ETag"""
+        if pa is None:
+            return
+
+        try:
+            # All columns are kept: search_recipes can match on any of them
+            buffer = io.BytesIO()
+            self.data.to_parquet(
+                buffer, engine="pyarrow", compression="zstd", index=False
+            )
+            buffer.seek(0)
+            self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_name
+            ).upload_blob(
+                buffer, overwrite=True, metadata={"source_etag": self._source[1]}
+            )
+        except Exception as e:
+            logging.warning(f"Could not save cleaned data to {blob_name}: {e}")
+
     def load_data_from_content(self, content: bytes) -> bool:
         """
         Load diet data from blob content (useful for blob triggers)
@@ -98,7 +400,9 @@ class AzureDietDataProcessor:
             bool: True if data loaded successfully, False otherwise
         """
         try:
-            self.data = pd.read_csv(io.BytesIO(content))
+            self._cache.clear()
+            self._source = None
+            self.data = _read_diet_csv(io.BytesIO(content))
             logging.info(
                 f"Successfully loaded {len(self.data)} records from blob content"
             )
@@ -131,13 +435,16 @@ class AzureDietDataProcessor:
             )
 
             if format_type.lower() == "json":
-                import json
-
-                content = json.dumps(data, indent=2)
+                content = to_json_bytes(data)
                 content_type = "application/json"
             elif format_type.lower() == "csv" and isinstance(data, list):
-                df = pd.DataFrame(data)
-                content = df.to_csv(index=False)
+                if pa is not None:
+                    # Records go straight to Arrow's CSV writer, no DataFrame
+                    sink = pa.BufferOutputStream()
+                    pacsv.write_csv(pa.Table.from_pylist(data), sink)
+                    content = sink.getvalue().to_pybytes()
+                else:
+                    content = pd.DataFrame(data).to_csv(index=False)
                 content_type = "text/csv"
             else:
                 raise ValueError("Unsupported format type or data structure")
@@ -157,23 +464,90 @@ class AzureDietDataProcessor:
 
         logging.info("Cleaning data...")
 
-        # Fill missing numeric values with mean
-        numeric_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
-        for col in numeric_cols:
-            if col in self.data.columns:
-                mean_val = self.data[col].mean()
-                self.data[col] = self.data[col].fillna(mean_val)
+        numeric_cols = [
+            col
+            for col in ["Protein(g)", "Carbs(g)", "Fat(g)"]
+            if col in self.data.columns
+        ]
+        categorical_cols = [
+            col for col in ["Diet_type", "Cuisine_type"] if col in self.data.columns
+        ]
 
-        # Fill missing categorical values
-        categorical_cols = ["Diet_type", "Cuisine_type"]
+        # Missing numeric values take the column mean, categorical ones the mode
+        fill_values = self.data[numeric_cols].mean().to_dict()
         for col in categorical_cols:
-            if col in self.data.columns:
-                mode_value = self.data[col].mode()
-                fill_value = mode_value[0] if len(mode_value) > 0 else "Unknown"
-                self.data[col] = self.data[col].fillna(fill_value)
-
+            # Keep categoricals as category codes; the fill value must be a category
+            column = self.data[col].astype("category")
+            mode_value = column.mode()
+            fill_value = mode_value.iat[0] if not mode_value.empty else "Unknown"
+            if fill_value not in column.cat.categories:
+                column = column.cat.add_categories(fill_value)
+            self.data[col] = column
+            fill_values[col] = fill_value
+
+        # One fillna over all columns instead of one per column
+        if fill_values:
+            self.data = self.data.fillna(fill_values)
+
+        # Grams to two decimals fit float32; halves every later scan
+        self.data = self.data.astype({col: np.float32 for col in numeric_cols})
+
+        self._prepare_data()
         logging.info("Data cleaning completed")
 
+    def _prepare_data(self):
+        """Reset derived state and precompute lookups for freshly loaded clean data"""
+        self._grouped_by_diet = None
+        self._page_filter = None
+        self._recipe_name_lower = None
+        self._cache.clear()
+        self._key_locks.clear()
+
+        # Nutrient columns are plain float arrays, so these are views, not copies
+        numeric_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+        self._cols = {
+            col: self.data[col].to_numpy()
+            for col in numeric_cols
+            if col in self.data.columns
+        }
+
+        # Lower-cased once so name searches are plain substring matches
+        if "Recipe_name" in self.data.columns and pd.api.types.is_string_dtype(
+            self.data["Recipe_name"]
+        ):
+            self._recipe_name_lower = self.data["Recipe_name"].str.lower()
+
+    def _memo(self, key: tuple, compute: Callable):
+        """Return the cached value for key, computing it on first use"""
+        if key in self._cache:
+            return self._cache[key]
+
+        # Concurrent callers of the same key wait for one computation (e.g.
+        # K-Means) rather than each running it
+        with self._cache_lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+    def _contains(self, column: str, term: str) -> pd.Series:
+        """Case-insensitive literal substring match of term against a column"""
+        if column == "Recipe_name" and self._recipe_name_lower is not None:
+            return self._recipe_name_lower.str.contains(
+                term.lower(), regex=False, na=False
+            )
+        return self.data[column].str.contains(term, case=False, regex=False, na=False)
+
+    def _diet_groups(self):
+        """Groupby on Diet_type, built once per loaded dataset and reused"""
+        if self._grouped_by_diet is None:
+            self._grouped_by_diet = self.data.groupby(
+                "Diet_type", sort=False, observed=True
+            )
+        return self._grouped_by_diet
+
+    @_memoized
     def get_macronutrient_averages(self) -> Dict[str, Dict[str, float]]:
         """Get average macronutrient content by diet type"""
         if self.data is None:
@@ -187,20 +561,22 @@ class AzureDietDataProcessor:
             logging.warning("Required columns not found in data")
             return {}
 
-        result = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
-            averages = {}
-            for col in available_cols:
-                averages[col.replace("(g)", "")] = round(diet_data[col].mean(), 2)
-            result[diet_type] = averages
+        averages = (
+            self._diet_groups()[available_cols].mean().astype("float64").round(2)
+        )
+        averages.columns = [col.replace("(g)", "") for col in available_cols]
 
-        return result
+        return averages.to_dict(orient="index")
 
+    @_memoized
     def get_diet_comparison_data(self) -> List[Dict]:
         """Get comparison data between different diet types"""
         averages = self.get_macronutrient_averages()
         comparison_data = []
+        if not averages:
+            return comparison_data
+
+        recipe_counts = self._diet_groups().size()
 
         for diet_type, macros in averages.items():
             diet_info = {
@@ -208,7 +584,7 @@ class AzureDietDataProcessor:
                 "protein": macros.get("Protein", 0),
                 "carbs": macros.get("Carbs", 0),
                 "fat": macros.get("Fat", 0),
-                "total_recipes": len(self.data[self.data["Diet_type"] == diet_type]),
+                "total_recipes": int(recipe_counts.get(diet_type, 0)),
             }
             comparison_data.append(diet_info)
 
@@ -221,26 +597,47 @@ class AzureDietDataProcessor:
         if self.data is None:
             return []
 
+        # Validated before memoizing, so arbitrary query strings can't grow the cache
         nutrient_col = f"{nutrient}(g)"
         if nutrient_col not in self.data.columns:
             logging.warning(f"Nutrient column {nutrient_col} not found")
             return []
 
-        top_recipes = self.data.nlargest(n, nutrient_col)
+        return self._top_recipes(nutrient, n)
 
-        result = []
-        for _, recipe in top_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "nutrient_value": round(recipe[nutrient_col], 2),
-                "nutrient_type": nutrient,
-            }
-            result.append(recipe_info)
+    @_memoized
+    def _top_recipes(self, nutrient: str, n: int) -> List[Dict]:
+        """Top N recipes by an existing nutrient column"""
+        nutrient_col = f"{nutrient}(g)"
 
-        return result
+        # Partition on the raw column instead of nlargest(): O(N) selection of
+        # the n largest non-NaN values, keeping the earliest rows on ties
+        values = self._cols.get(nutrient_col)
+        if values is None:
+            values = self.data[nutrient_col].to_numpy(dtype="float64", na_value=np.nan)
+        valid = np.flatnonzero(~np.isnan(values))
+        if n <= 0:
+            valid = valid[:0]
+        elif n < len(valid):
+            kth = np.partition(values[valid], -n)[-n]
+            above = valid[values[valid] > kth]
+            ties = valid[values[valid] == kth][: n - len(above)]
+            valid = np.concatenate([above, ties])
+        order = np.lexsort((valid, -values[valid]))
+        top_recipes = self.data.iloc[valid[order]]
+
+        return _recipe_records(
+            top_recipes,
+            {
+                "recipe_name": "Recipe_name",
+                "diet_type": "Diet_type",
+                "cuisine_type": "Cuisine_type",
+                "nutrient_value": nutrient_col,
+            },
+            nutrient_type=nutrient,
+        )
 
+    @_memoized
     def get_cuisine_distribution(self) -> Dict[str, Dict[str, int]]:
         """Get cuisine distribution by diet type"""
         if (
@@ -250,89 +647,101 @@ class AzureDietDataProcessor:
         ):
             return {}
 
-        result = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
-            cuisine_counts = diet_data["Cuisine_type"].value_counts().to_dict()
-            result[diet_type] = cuisine_counts
+        grouped = self._diet_groups()
+        cuisine_counts = _value_counts(grouped["Cuisine_type"])
 
-        return result
+        return {
+            diet_type: cuisine_counts.loc[diet_type].to_dict()
+            for diet_type in grouped.size().index
+        }
 
+    @_memoized
     def get_nutrient_ranges(self) -> Dict[str, Dict[str, float]]:
         """Get min, max, and average values for each nutrient"""
         if self.data is None:
             return {}
 
         nutrient_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
-        result = {}
-
-        for col in nutrient_cols:
-            if col in self.data.columns:
-                nutrient_name = col.replace("(g)", "")
-                result[nutrient_name] = {
-                    "min": round(self.data[col].min(), 2),
-                    "max": round(self.data[col].max(), 2),
-                    "average": round(self.data[col].mean(), 2),
-                    "median": round(self.data[col].median(), 2),
-                }
+        available_cols = [col for col in nutrient_cols if col in self.data.columns]
+        if not available_cols:
+            return {}
 
-        return result
+        # One row of [min, max, average, median] per column, rounded together
+        stats = np.full((len(available_cols), 4), np.nan)
+        for row, col in enumerate(available_cols):
+            values = self._cols[col]
+            if not np.isnan(values).all():
+                stats[row] = [
+                    np.nanmin(values),
+                    np.nanmax(values),
+                    np.nanmean(values, dtype=np.float64),
+                    np.nanmedian(values),
+                ]
 
+        return {
+            col.replace("(g)", ""): dict(zip(["min", "max", "average", "median"], row))
+            for col, row in zip(available_cols, stats.round(2).tolist())
+        }
+
+    @_memoized
     def get_diet_summary(self) -> Dict:
         """Get overall summary statistics"""
         if self.data is None:
             return {}
 
+        diet_counts = (
+            self._category_counts("Diet_type")
+            if "Diet_type" in self.data.columns
+            else pd.Series(dtype="int64")
+        )
+        cuisine_counts = (
+            self._category_counts("Cuisine_type")
+            if "Cuisine_type" in self.data.columns
+            else pd.Series(dtype="int64")
+        )
+
         return {
             "total_recipes": len(self.data),
-            "total_diet_types": (
-                self.data["Diet_type"].nunique()
-                if "Diet_type" in self.data.columns
-                else 0
-            ),
-            "total_cuisine_types": (
-                self.data["Cuisine_type"].nunique()
-                if "Cuisine_type" in self.data.columns
-                else 0
-            ),
+            "total_diet_types": len(diet_counts),
+            "total_cuisine_types": len(cuisine_counts),
             "diet_types": (
                 self.data["Diet_type"].unique().tolist()
                 if "Diet_type" in self.data.columns
                 else []
             ),
-            "most_common_diet": (
-                self.data["Diet_type"].mode()[0]
-                if "Diet_type" in self.data.columns
-                and len(self.data["Diet_type"].mode()) > 0
-                else "Unknown"
-            ),
-            "most_common_cuisine": (
-                self.data["Cuisine_type"].mode()[0]
-                if "Cuisine_type" in self.data.columns
-                and len(self.data["Cuisine_type"].mode()) > 0
-                else "Unknown"
-            ),
+            "most_common_diet": _counts_mode(diet_counts),
+            "most_common_cuisine": _counts_mode(cuisine_counts),
         }
 
+    @_memoized
+    def _category_counts(self, col: str) -> pd.Series:
+        """Rows per category of a categorical column, most common first"""
+        column = self.data[col]
+        codes = column.cat.codes.to_numpy()
+        codes = codes[codes >= 0]
+
+        # One bincount over the integer codes; ranking the codes in order of
+        # first appearance with a stable sort keeps ties the way value_counts()
+        # orders them (unused categories never appear, so they drop out)
+        counts = np.bincount(codes, minlength=len(column.cat.categories))
+        seen = pd.unique(codes)
+        order = seen[np.argsort(-counts[seen], kind="stable")]
+        return pd.Series(counts[order], index=column.cat.categories[order])
+
     def get_recipes_by_diet_type(self, diet_type: str) -> List[Dict]:
         """Get all recipes for a specific diet type"""
         if self.data is None or "Diet_type" not in self.data.columns:
             return []
 
-        diet_recipes = self.data[self.data["Diet_type"] == diet_type]
-
-        result = []
-        for _, recipe in diet_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            result.append(recipe_info)
+        try:
+            diet_recipes = self._diet_groups().get_group(diet_type)
+        except KeyError:
+            return []
 
-        return result
+        fields = {
+            key: col for key, col in RECIPE_FIELDS.items() if key != "diet_type"
+        }
+        return _recipe_records(diet_recipes, fields)
 
     def search_recipes(
         self, search_term: str, search_field: str = "Recipe_name"
@@ -342,23 +751,9 @@ class AzureDietDataProcessor:
             return []
 
         # Case-insensitive search
-        matching_recipes = self.data[
-            self.data[search_field].str.contains(search_term, case=False, na=False)
-        ]
+        matching_recipes = self.data[self._contains(search_field, search_term)]
 
-        result = []
-        for _, recipe in matching_recipes.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            result.append(recipe_info)
-
-        return result
+        return _recipe_records(matching_recipes, RECIPE_FIELDS)
 
     # ===== NEW ENHANCED METHODS FOR FRONTEND DASHBOARD =====
 
@@ -406,46 +801,37 @@ class AzureDietDataProcessor:
         if self.data is None:
             return {"error": "No data available"}
 
-        # Start with all data
-        filtered_data = self.data.copy()
+        # Row positions matching the filters; successive pages of the same
+        # query reuse them instead of re-scanning the columns. Read once, as a
+        # concurrent request may swap in its own query's rows
+        filters = (diet_type, search_term)
+        page_filter = self._page_filter
+        if page_filter is None or page_filter[0] != filters:
+            mask = np.ones(len(self.data), dtype=bool)
 
-        # Apply diet type filter
-        if diet_type and "Diet_type" in filtered_data.columns:
-            filtered_data = filtered_data[
-                filtered_data["Diet_type"].str.contains(diet_type, case=False, na=False)
-            ]
+            # Apply diet type filter
+            if diet_type and "Diet_type" in self.data.columns:
+                mask &= self._contains("Diet_type", diet_type).to_numpy(dtype=bool)
 
-        # Apply search filter
-        if search_term and "Recipe_name" in filtered_data.columns:
-            filtered_data = filtered_data[
-                filtered_data["Recipe_name"].str.contains(
-                    search_term, case=False, na=False
-                )
-            ]
+            # Apply search filter
+            if search_term and "Recipe_name" in self.data.columns:
+                mask &= self._contains("Recipe_name", search_term).to_numpy(dtype=bool)
+
+            page_filter = (filters, np.flatnonzero(mask))
+            self._page_filter = page_filter
+        rows = page_filter[1]
 
         # Calculate pagination
-        total_recipes = len(filtered_data)
+        total_recipes = len(rows)
         total_pages = (total_recipes + page_size - 1) // page_size
         start_idx = (page - 1) * page_size
         end_idx = start_idx + page_size
 
         # Get page data
-        page_data = filtered_data.iloc[start_idx:end_idx]
-
-        recipes = []
-        for _, recipe in page_data.iterrows():
-            recipe_info = {
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "diet_type": recipe.get("Diet_type", "Unknown"),
-                "cuisine_type": recipe.get("Cuisine_type", "Unknown"),
-                "protein": round(recipe.get("Protein(g)", 0), 2),
-                "carbs": round(recipe.get("Carbs(g)", 0), 2),
-                "fat": round(recipe.get("Fat(g)", 0), 2),
-            }
-            recipes.append(recipe_info)
+        page_data = self.data.iloc[rows[start_idx:end_idx]]
 
         return {
-            "recipes": recipes,
+            "recipes": _recipe_records(page_data, RECIPE_FIELDS),
             "pagination": {
                 "current_page": page,
                 "total_pages": total_pages,
@@ -457,15 +843,48 @@ class AzureDietDataProcessor:
             "filters": {"diet_type": diet_type, "search_term": search_term},
         }
 
+    @_memoized
     def get_recipe_clusters(self) -> Dict:
-        """Get recipe clusters based on nutritional similarity"""
+        """Get recipe clusters, reusing results persisted for the same source data"""
         if self.data is None:
             return {"error": "No data available"}
 
+        stored = self._load_stored_clusters()
+        if stored is not None:
+            return stored
+
+        result = self._compute_recipe_clusters()
+        if self._source is not None and "clusters" in result:
+            self.upload_results_to_blob(
+                {"source_etag": self._source[1], "result": result},
+                self.clusters_blob_name,
+            )
+        return result
+
+    def _load_stored_clusters(self) -> Optional[Dict]:
+        """Read clusters persisted for the currently loaded blob, if any"""
+        if self._source is None:
+            return None
+
         try:
-            from sklearn.cluster import KMeans
-            from sklearn.preprocessing import StandardScaler
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=self.clusters_blob_name
+            )
+            stored = orjson.loads(blob_client.download_blob().readall())
+        except ResourceNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Could not read stored clusters: {e}")
+            return None
+
+        if stored.get("source_etag") != self._source[1]:
+            return None
+        return stored.get("result")
+
+    def _compute_recipe_clusters(self) -> Dict:
+        """Cluster recipes based on nutritional similarity"""
 
+        try:
             # Prepare data for clustering
             features = ["Protein(g)", "Carbs(g)", "Fat(g)"]
             available_features = [f for f in features if f in self.data.columns]
@@ -475,9 +894,12 @@ class AzureDietDataProcessor:
 
             cluster_data = self.data[available_features].dropna()
 
-            # Normalize the data
-            scaler = StandardScaler()
-            normalized_data = scaler.fit_transform(cluster_data)
+            # Normalize the data (zero mean, unit variance; constant columns
+            # are only centred)
+            values = cluster_data.to_numpy(dtype="float64")
+            std = values.std(axis=0)
+            std[std == 0] = 1.0
+            normalized_data = (values - values.mean(axis=0)) / std
 
             # Perform clustering
             n_clusters = min(
@@ -486,35 +908,33 @@ class AzureDietDataProcessor:
             if n_clusters < 2:
                 n_clusters = 2
 
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            cluster_labels = kmeans.fit_predict(normalized_data)
+            cluster_labels = _kmeans_labels(normalized_data, n_clusters)
+
+            # Per-cluster averages from one groupby, rounded once
+            cluster_means = (
+                cluster_data.groupby(cluster_labels)
+                .mean()
+                .astype("float64")
+                .round(2)
+                .reindex(range(n_clusters))
+                .to_dict(orient="index")
+            )
 
             # Analyze clusters
             clusters = {}
             for i in range(n_clusters):
                 cluster_indices = cluster_data.index[cluster_labels == i]
                 cluster_recipes = self.data.loc[cluster_indices]
+                means = cluster_means[i]
 
                 cluster_info = {
                     "cluster_id": i,
                     "size": len(cluster_recipes),
-                    "avg_protein": (
-                        round(cluster_recipes["Protein(g)"].mean(), 2)
-                        if "Protein(g)" in cluster_recipes.columns
-                        else 0
-                    ),
-                    "avg_carbs": (
-                        round(cluster_recipes["Carbs(g)"].mean(), 2)
-                        if "Carbs(g)" in cluster_recipes.columns
-                        else 0
-                    ),
-                    "avg_fat": (
-                        round(cluster_recipes["Fat(g)"].mean(), 2)
-                        if "Fat(g)" in cluster_recipes.columns
-                        else 0
-                    ),
+                    "avg_protein": means.get("Protein(g)", 0),
+                    "avg_carbs": means.get("Carbs(g)", 0),
+                    "avg_fat": means.get("Fat(g)", 0),
                     "common_diet_types": (
-                        cluster_recipes["Diet_type"].value_counts().head(3).to_dict()
+                        _value_counts(cluster_recipes["Diet_type"]).head(3).to_dict()
                         if "Diet_type" in cluster_recipes.columns
                         else {}
                     ),
@@ -534,7 +954,7 @@ class AzureDietDataProcessor:
             }
 
         except ImportError:
-            # Fallback if sklearn is not available
+            # Fallback if neither faiss nor sklearn is available
             return self._simple_recipe_grouping()
 
     def _simple_recipe_grouping(self) -> Dict:
@@ -542,28 +962,18 @@ class AzureDietDataProcessor:
         if "Diet_type" not in self.data.columns:
             return {"error": "No diet type data available for grouping"}
 
-        groups = {}
-        for diet_type in self.data["Diet_type"].unique():
-            diet_data = self.data[self.data["Diet_type"] == diet_type]
+        # Rounded per-diet averages, computed once for all groups
+        averages = self.get_macronutrient_averages()
 
+        groups = {}
+        for diet_type, diet_data in self._diet_groups():
+            macros = averages.get(diet_type, {})
             group_info = {
                 "group_name": diet_type,
                 "size": len(diet_data),
-                "avg_protein": (
-                    round(diet_data["Protein(g)"].mean(), 2)
-                    if "Protein(g)" in diet_data.columns
-                    else 0
-                ),
-                "avg_carbs": (
-                    round(diet_data["Carbs(g)"].mean(), 2)
-                    if "Carbs(g)" in diet_data.columns
-                    else 0
-                ),
-                "avg_fat": (
-                    round(diet_data["Fat(g)"].mean(), 2)
-                    if "Fat(g)" in diet_data.columns
-                    else 0
-                ),
+                "avg_protein": macros.get("Protein", 0),
+                "avg_carbs": macros.get("Carbs", 0),
+                "avg_fat": macros.get("Fat", 0),
                 "sample_recipes": (
                     diet_data["Recipe_name"].head(5).tolist()
                     if "Recipe_name" in diet_data.columns
@@ -578,20 +988,22 @@ class AzureDietDataProcessor:
             "note": "Using simple diet type grouping",
         }
 
+    @_memoized
     def get_diet_types(self) -> Dict:
         """Get available diet types for filter dropdown"""
         if self.data is None or "Diet_type" not in self.data.columns:
             return {"diet_types": []}
 
-        diet_types = self.data["Diet_type"].dropna().unique().tolist()
-        diet_counts = self.data["Diet_type"].value_counts().to_dict()
+        diet_counts = self._category_counts("Diet_type")
+        diet_types = diet_counts.index.tolist()
 
         return {
             "diet_types": sorted(diet_types),
-            "diet_counts": diet_counts,
+            "diet_counts": diet_counts.to_dict(),
             "total_types": len(diet_types),
         }
 
+    @_memoized
     def get_bar_chart_data(self) -> Dict:
         """Get data formatted for bar chart: Average macronutrient content by diet type"""
         macros = self.get_macronutrient_averages()
@@ -641,17 +1053,29 @@ class AzureDietDataProcessor:
         if self.data is None:
             return {"error": "No data available"}
 
+        # Validated before memoizing, so arbitrary query strings can't grow the cache
         x_col = f"{x_nutrient}(g)"
         y_col = f"{y_nutrient}(g)"
 
         if x_col not in self.data.columns or y_col not in self.data.columns:
             return {"error": f"Nutrient columns {x_col} or {y_col} not found"}
 
-        # Sample data for performance (max 500 points)
+        return self._scatter_plot_data(x_nutrient, y_nutrient)
+
+    @_memoized
+    def _scatter_plot_data(self, x_nutrient: str, y_nutrient: str) -> Dict:
+        """Scatter plot data for two existing nutrient columns"""
+        x_col = f"{x_nutrient}(g)"
+        y_col = f"{y_nutrient}(g)"
+
+        # Sample data for performance (max 500 points): draw only the sampled
+        # positions rather than permuting every row. The fixed seed keeps the
+        # chart stable between refreshes, so the result can be memoized
         sample_size = min(500, len(self.data))
-        sample_data = self.data.sample(n=sample_size)
+        rng = np.random.default_rng(0)
+        sample_rows = rng.choice(len(self.data), size=sample_size, replace=False)
+        sample_data = self.data.iloc[np.sort(sample_rows)]
 
-        scatter_data = []
         colors = {}
         diet_types = (
             sample_data["Diet_type"].unique()
@@ -660,27 +1084,24 @@ class AzureDietDataProcessor:
         )
 
         # Assign colors to diet types
-        color_palette = [
-            "#FF6384",
-            "#36A2EB",
-            "#FFCE56",
-            "#4BC0C0",
-            "#9966FF",
-            "#FF9F40",
-        ]
         for i, diet in enumerate(diet_types):
-            colors[diet] = color_palette[i % len(color_palette)]
+            colors[diet] = CHART_COLORS[i % len(CHART_COLORS)]
 
-        for _, recipe in sample_data.iterrows():
-            diet_type = recipe.get("Diet_type", "Unknown")
-            point = {
-                "x": round(recipe[x_col], 2),
-                "y": round(recipe[y_col], 2),
-                "diet_type": diet_type,
-                "recipe_name": recipe.get("Recipe_name", "Unknown"),
-                "color": colors.get(diet_type, "#999999"),
-            }
-            scatter_data.append(point)
+        point_colors = (
+            sample_data["Diet_type"].map(colors).astype(object).fillna("#999999")
+            if "Diet_type" in sample_data.columns
+            else colors["Unknown"]
+        )
+        scatter_data = _recipe_records(
+            sample_data,
+            {
+                "x": x_col,
+                "y": y_col,
+                "diet_type": "Diet_type",
+                "recipe_name": "Recipe_name",
+            },
+            color=point_colors,
+        )
 
         return {
             "chart_type": "scatter",
@@ -692,6 +1113,25 @@ class AzureDietDataProcessor:
             "colors": colors,
         }
 
+    @_memoized
+    def _nutrient_correlations(self) -> pd.DataFrame:
+        """Nutrient correlation matrix shared by the heatmap and correlation views"""
+        nutrient_cols = ["Protein(g)", "Carbs(g)", "Fat(g)"]
+        available_cols = [col for col in nutrient_cols if col in self.data.columns]
+
+        if njit is None:
+            return self.data[available_cols].corr()
+
+        values = np.stack(
+            [self._cols[col] for col in available_cols], axis=1, dtype=np.float64
+        )
+        if len(values):
+            values = values - np.nanmean(values, axis=0)
+        return pd.DataFrame(
+            _corr_kernel(values), index=available_cols, columns=available_cols
+        )
+
+    @_memoized
     def get_heatmap_data(self) -> Dict:
         """Get data formatted for heatmap: Nutrient correlations"""
         if self.data is None:
@@ -703,8 +1143,8 @@ class AzureDietDataProcessor:
         if len(available_cols) < 2:
             return {"error": "Insufficient nutrient data for correlation analysis"}
 
-        # Calculate correlation matrix
-        correlation_matrix = self.data[available_cols].corr()
+        # Calculate correlation matrix, rounded once for every cell
+        correlation_matrix = self._nutrient_correlations().astype("float64").round(3)
 
         # Format for heatmap
         labels = [col.replace("(g)", "") for col in available_cols]
@@ -712,7 +1152,7 @@ class AzureDietDataProcessor:
 
         for i, row_label in enumerate(labels):
             for j, col_label in enumerate(labels):
-                correlation_value = round(correlation_matrix.iloc[i, j], 3)
+                correlation_value = correlation_matrix.iat[i, j].item()
                 data.append(
                     {
                         "x": j,
@@ -732,20 +1172,23 @@ class AzureDietDataProcessor:
             "max_value": 1,
         }
 
+    @_memoized
     def get_pie_chart_data(self) -> Dict:
         """Get data formatted for pie chart: Recipe distribution by diet type"""
         if self.data is None or "Diet_type" not in self.data.columns:
             return {"error": "No diet type data available"}
 
-        diet_counts = self.data["Diet_type"].value_counts()
+        diet_counts = self._category_counts("Diet_type")
 
-        # Format for Chart.js pie chart
+        # Format for Chart.js pie chart; counts stay a numpy array for orjson
+        # (labels are strings, which it can't take as an object array)
         labels = diet_counts.index.tolist()
-        data_values = diet_counts.values.tolist()
+        data_values = diet_counts.to_numpy()
 
         # Generate colors
-        colors = ["#FF6384", "#36A2EB", "#FFCE56", "#4BC0C0", "#9966FF", "#FF9F40"]
-        background_colors = [colors[i % len(colors)] for i in range(len(labels))]
+        background_colors = [
+            CHART_COLORS[i % len(CHART_COLORS)] for i in range(len(labels))
+        ]
 
         return {
             "chart_type": "pie",
@@ -758,9 +1201,10 @@ class AzureDietDataProcessor:
                     "borderWidth": 2,
                 }
             ],
-            "total_recipes": sum(data_values),
+            "total_recipes": int(data_values.sum()),
         }
 
+    @_memoized
     def get_nutrient_correlations(self) -> Dict:
         """Get detailed nutrient correlation analysis"""
         if self.data is None:
@@ -773,13 +1217,13 @@ class AzureDietDataProcessor:
             return {"correlations": {}}
 
         correlations = {}
-        correlation_matrix = self.data[available_cols].corr()
+        correlation_matrix = self._nutrient_correlations().astype("float64").round(3)
 
         for i in range(len(available_cols)):
             for j in range(i + 1, len(available_cols)):
                 nutrient1 = available_cols[i].replace("(g)", "")
                 nutrient2 = available_cols[j].replace("(g)", "")
-                correlation_value = round(correlation_matrix.iloc[i, j], 3)
+                correlation_value = correlation_matrix.iat[i, j].item()
 
                 correlations[f"{nutrient1}_vs_{nutrient2}"] = {
                     "correlation": correlation_value,
@@ -0,0 +1,7 @@
+def fingerprint(text: str) -> int:
+    # 64-bit character-presence bitmap: bit (byte & 63) is set for every UTF-8
+    # byte in text. A name can only contain a keyword if it has all its bits.
+    bits = 0
+    for byte in set(text.encode("utf-8")):
+        bits |= 1 << (byte & 63)
+    return bits